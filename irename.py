@@ -17,18 +17,94 @@
 
 # Import libraries
 
+import argparse
+import contextlib
+import ctypes
+import errno
+import json
+import mmap
 import os
+import platform
+import shutil
+import sqlite3
+import struct
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Any, Optional, Union
 import exifread
 from PIL import Image, UnidentifiedImageError
-from pillow_heif import register_heif_opener
+from pillow_heif import open_heif, register_heif_opener
+
+try:
+    import liburing
+except ImportError:
+    liburing = None
 
 register_heif_opener()
 
 # Set valid file extensions
 VALID_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".heic"}
 VALID_VIDEO_EXTENSIONS = {".mov", ".mp4", ".mkv"}
-VALID_EXTENSIONS = VALID_IMAGE_EXTENSIONS | VALID_VIDEO_EXTENSIONS
+
+# Kind of each valid extension and the file name prefix of each kind
+EXT_TO_KIND = {
+    **dict.fromkeys(VALID_IMAGE_EXTENSIONS, "img"),
+    **dict.fromkeys(VALID_VIDEO_EXTENSIONS, "vid"),
+}
+KIND_TO_PREFIX = {"img": "IMG_", "vid": "VID_"}
+
+# Bytes read from the start of a file when looking for the EXIF block
+EXIF_HEADER_READ_SIZE = 64 * 1024
+
+# Name of the EXIF date cache kept inside the processed folder
+EXIF_CACHE_FILE_NAME = ".irename_cache.db"
+
+# renameat2() flag that fails with EEXIST instead of replacing the target
+RENAME_NOREPLACE = 1
+AT_FDCWD = -100
+
+# renameat2() errors meaning the kernel or filesystem cannot honour the flag
+RENAME_NOREPLACE_UNSUPPORTED = {errno.EINVAL, errno.ENOSYS, errno.ENOTSUP, errno.EOPNOTSUPP}
+
+# Submission queue size of the io_uring backend
+URING_RING_SIZE = 128
+
+# Number of files processed concurrently; the work is I/O-bound
+DEFAULT_MAX_CONCURRENCY = min(8, os.cpu_count() or 1)
+
+# Serializes log/console output and target-name claims across worker threads
+_output_lock = threading.Lock()
+_claimed_paths: set = set()
+
+# Log files opened by append_to_file, kept open until close_log_files()
+_log_files = contextlib.ExitStack()
+_log_handles: dict = {}
+
+# EXIF date strings extracted up front by ExifTool, keyed by normalized path.
+# A value of None means ExifTool read the file but found no date.
+_batch_exif_dates: dict = {}
+
+# Persistent EXIF date cache of the folder being processed, if enabled
+_exif_cache: Optional["ExifCache"] = None
+
+
+def _load_renameat2():
+    """Return libc's renameat2 on Linux, or None when it is unavailable."""
+    if platform.system() != "Linux":
+        return None
+    try:
+        renameat2 = ctypes.CDLL("libc.so.6", use_errno=True).renameat2
+    except (OSError, AttributeError):
+        return None
+    renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    renameat2.restype = ctypes.c_int
+    return renameat2
+
+
+_renameat2 = _load_renameat2()
 
 
 class ExifMetadataNotFound(Exception):
@@ -39,58 +115,440 @@ class DateNotFoundInFile(Exception):
     pass
 
 
+class ExifToolSession:
+    """A single long-running exiftool process fed through its argfile on stdin."""
+
+    def __init__(self, executable: str = "exiftool"):
+        self.executable = executable
+        self.process: Any = None
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [self.executable, "-stay_open", "True", "-@", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            encoding="utf-8",
+            errors="surrogateescape",  # Round-trip non-UTF-8 file names byte for byte
+        )
+        return self
+
+    def __exit__(self, *exc_info):
+        self.process.stdin.write("-stay_open\nFalse\n")
+        self.process.stdin.flush()
+        self.process.stdin.close()
+        self.process.wait()
+        self.process.stdout.close()
+
+    def execute(self, *args: str) -> str:
+        """Run one command and return its output up to the {ready} sentinel."""
+        self.process.stdin.write("\n".join(args) + "\n-execute\n")
+        self.process.stdin.flush()
+        output = []
+        for line in self.process.stdout:
+            if line.strip() == "{ready}":
+                break
+            output.append(line)
+        return "".join(output)
+
+    def get_dates(self, file_paths: list) -> dict:
+        """Map each readable file to its DateTimeOriginal (or DateTime) string."""
+        if not file_paths:
+            return {}
+        output = self.execute(
+            "-charset", "filename=utf8", "-j", "-EXIF:DateTimeOriginal", "-EXIF:ModifyDate", *file_paths
+        )
+        dates = {}
+        for tags in json.loads(output or "[]"):
+            if "Error" in tags:
+                continue
+            date_str = tags.get("DateTimeOriginal") or tags.get("ModifyDate")
+            dates[_normalize_path(tags["SourceFile"])] = str(date_str) if date_str else None
+        return dates
+
+
+def _cache_key(file_path: str) -> bytes:
+    """The absolute path of a file as bytes, the key of its ExifCache entry."""
+    return os.fsencode(os.path.abspath(file_path))
+
+
+class ExifCache:
+    """EXIF dates stored in SQLite, keyed by absolute path, mtime and size.
+
+    Paths are stored as their file system bytes, so names that are not valid
+    UTF-8 can be cached too.
+    """
+
+    def __init__(self, db_path: str):
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS exif_dates ("
+                "path BLOB PRIMARY KEY, mtime_ns INTEGER, size INTEGER, date TEXT)"
+            )
+
+    def get(self, file_path: str, stats: os.stat_result) -> tuple:
+        """Return (found, ISO date string or None if the file has no EXIF date)."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT mtime_ns, size, date FROM exif_dates WHERE path = ?",
+                (_cache_key(file_path),),
+            ).fetchone()
+        if row is None or row[:2] != (stats.st_mtime_ns, stats.st_size):
+            return False, None
+        return True, row[2]
+
+    def set(self, file_path: str, stats: os.stat_result, date_str: Optional[str]):
+        """Store the date of a file, replacing any stale entry."""
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO exif_dates VALUES (?, ?, ?, ?)",
+                (_cache_key(file_path), stats.st_mtime_ns, stats.st_size, date_str),
+            )
+
+    def rename(self, file_path: str, new_path: str):
+        """Keep an entry valid after its file has been renamed."""
+        with self.lock:
+            self.connection.execute(
+                "UPDATE OR REPLACE exif_dates SET path = ? WHERE path = ?",
+                (_cache_key(new_path), _cache_key(file_path)),
+            )
+
+    def close(self):
+        with self.lock:
+            self.connection.commit()
+            self.connection.close()
+
+
+def _normalize_path(file_path: str) -> str:
+    """Normalize a path so ExifTool's SourceFile matches our own paths."""
+    return os.path.normcase(os.path.normpath(file_path))
+
+
 def append_to_file(file_name: str, content: str, endl: bool = True):
-    """Append content to a file."""
-    with open(file_name, "a+") as file_handle:
+    """Append content to a file, which stays open until close_log_files()."""
+    with _output_lock:
+        file_handle = _log_handles.get(file_name)
+        if file_handle is None:
+            file_handle = _log_files.enter_context(open(file_name, "a+"))
+            _log_handles[file_name] = file_handle
         file_handle.write(content)
         if endl:
             file_handle.write("\n")
 
 
-def get_file_prefix(file_ext: str) -> str:
+def close_log_files():
+    """Flush and close the files opened by append_to_file."""
+    with _output_lock:
+        _log_files.close()
+        _log_handles.clear()
+
+
+def get_file_extension(file_name: str) -> str:
+    """Get the lowercase extension of a file name, including the dot."""
+    dot_index = file_name.rfind(".")
+    return file_name[dot_index:].lower() if dot_index > 0 else ""
+
+
+def get_file_prefix(file_extension: str) -> str:
     """Get file prefix based on file type."""
-    if file_ext in VALID_IMAGE_EXTENSIONS:
-        return "IMG_"
-    elif file_ext in VALID_VIDEO_EXTENSIONS:
-        return "VID_"
-    return ""
+    return KIND_TO_PREFIX.get(EXT_TO_KIND.get(file_extension, ""), "")
 
 
 def get_new_file_name(date: datetime, file_extension: str) -> str:
     """Generate a new file name based on the date."""
-    date_time = date.strftime("%Y%m%d_%H%M%S")
+    date_time = (
+        f"{date.year:04d}{date.month:02d}{date.day:02d}_"
+        f"{date.hour:02d}{date.minute:02d}{date.second:02d}"
+    )
     return f"{get_file_prefix(file_extension)}{date_time}{file_extension}"
 
 
-def get_file_creation_date(file_path: str) -> datetime:
-    """Get the earliest date between creation, modification, and birth time."""
-    stats = os.stat(file_path)
-    m_time = datetime.fromtimestamp(stats.st_mtime)
-    c_time = datetime.fromtimestamp(stats.st_ctime)
-    b_time = datetime.fromtimestamp(getattr(stats, "st_birthtime", stats.st_ctime))
-    return min(m_time, c_time, b_time)
+def _format_from_timestamp(timestamp: float) -> str:
+    """Format a timestamp as YYYYMMDD_HHMMSS in local time, without building a datetime."""
+    return time.strftime("%Y%m%d_%H%M%S", time.localtime(timestamp))
+
+
+def get_new_file_name_from_timestamp(timestamp: float, file_extension: str) -> str:
+    """Generate a new file name based on a file timestamp."""
+    return f"{get_file_prefix(file_extension)}{_format_from_timestamp(timestamp)}{file_extension}"
+
+
+def _get_file_timestamp_with_birthtime(file_path: str, stats: Optional[os.stat_result] = None) -> float:
+    """Get the earliest timestamp between creation, modification, and birth time."""
+    if stats is None:
+        stats = os.stat(file_path)
+    birth_time = stats.st_birthtime  # type: ignore[attr-defined]  # Only on macOS/BSD/Windows
+    return min(stats.st_mtime, stats.st_ctime, birth_time)
+
+
+def _get_file_timestamp_without_birthtime(file_path: str, stats: Optional[os.stat_result] = None) -> float:
+    """Get the earliest timestamp between creation and modification time."""
+    if stats is None:
+        stats = os.stat(file_path)
+    return min(stats.st_mtime, stats.st_ctime)
+
+
+# Whether the platform reports file birth times is fixed, so pick the variant once
+HAS_BIRTHTIME = hasattr(os.stat_result, "st_birthtime")
+get_file_timestamp = (
+    _get_file_timestamp_with_birthtime if HAS_BIRTHTIME else _get_file_timestamp_without_birthtime
+)
 
 
 def create_datetime(date_str: str) -> datetime:
-    """Convert a date string into a datetime object."""
-    return datetime.strptime(date_str, "%Y:%m:%d %H:%M:%S")
+    """Convert a "YYYY:MM:DD HH:MM:SS" date string into a datetime object."""
+    return datetime(
+        int(date_str[0:4]),
+        int(date_str[5:7]),
+        int(date_str[8:10]),
+        int(date_str[11:13]),
+        int(date_str[14:16]),
+        int(date_str[17:19]),
+    )
+
+
+def _tiff_get_datetime(tiff: bytes) -> Optional[str]:
+    """Read DateTimeOriginal (or DateTime) from a TIFF-structured EXIF block."""
+    byte_order = {b"II": "<", b"MM": ">"}.get(tiff[:2])
+    if byte_order is None:
+        return None
+
+    def read_ifd(offset: int) -> dict:
+        entries = {}
+        (count,) = struct.unpack_from(byte_order + "H", tiff, offset)
+        for index in range(count):
+            entry = struct.unpack_from(byte_order + "HHI4s", tiff, offset + 2 + index * 12)
+            entries[entry[0]] = entry[1:]
+        return entries
+
+    def read_ascii(entry: tuple) -> Optional[str]:
+        value_type, count, value = entry
+        if value_type != 2:  # ASCII
+            return None
+        if count > 4:
+            (value_offset,) = struct.unpack(byte_order + "I", value)
+            value = tiff[value_offset:value_offset + count]
+        return value[:count].split(b"\0", 1)[0].decode("ascii", "replace")
+
+    try:
+        (ifd0_offset,) = struct.unpack_from(byte_order + "I", tiff, 4)
+        ifd0 = read_ifd(ifd0_offset)
+        if 0x8769 in ifd0:  # ExifIFDPointer
+            (exif_offset,) = struct.unpack(byte_order + "I", ifd0[0x8769][2])
+            exif_ifd = read_ifd(exif_offset)
+            if 0x9003 in exif_ifd:  # DateTimeOriginal
+                return read_ascii(exif_ifd[0x9003])
+        if 0x0132 in ifd0:  # DateTime
+            return read_ascii(ifd0[0x0132])
+    except struct.error:
+        pass
+    return None
+
+
+def _jpeg_get_exif(data: Union[bytes, mmap.mmap]) -> Optional[bytes]:
+    """Return the TIFF block of the APP1 Exif segment found in the first bytes of a JPEG."""
+    if data[:2] != b"\xff\xd8":
+        return None
+    end = min(len(data), EXIF_HEADER_READ_SIZE)
+    position = 2
+    while position + 4 <= end:
+        marker, length = struct.unpack_from(">HH", data, position)
+        if marker == 0xFFE1 and data[position + 4:position + 10] == b"Exif\0\0":  # APP1
+            return data[position + 10:position + 2 + length]
+        if marker == 0xFFDA or marker >> 8 != 0xFF:  # Start of scan or corrupt
+            return None
+        position += 2 + length
+    return None
+
+
+def _mmap_jpeg_exif(file_handle) -> Optional[bytes]:
+    """Find the EXIF block of a JPEG through a memory map, touching only the pages scanned."""
+    try:
+        mapping = mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:  # Empty file
+        return None
+    except OSError:  # Filesystems that cannot be mapped (FUSE, MTP/gvfs, some network mounts)
+        return _jpeg_get_exif(file_handle.read(EXIF_HEADER_READ_SIZE))
+    with mapping:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mapping.madvise(mmap.MADV_SEQUENTIAL)
+        return _jpeg_get_exif(mapping)
+
+
+def _iter_boxes(data: bytes, start: int, end: int):
+    """Yield (type, payload start, box end) for ISO-BMFF boxes in data[start:end]."""
+    while start + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, start)
+        header_size = 8
+        if size == 1:
+            (size,) = struct.unpack_from(">Q", data, start + 8)
+            header_size = 16
+        elif size == 0:
+            size = end - start
+        if size < header_size:
+            return
+        yield box_type, start + header_size, min(start + size, end)
+        start += size
+
+
+def _heic_get_exif(file_handle, data: bytes) -> Optional[bytes]:
+    """Return the TIFF block of the Exif item of a HEIC file."""
+    meta = next(((s, e) for t, s, e in _iter_boxes(data, 0, len(data)) if t == b"meta"), None)
+    if meta is None:
+        return None
+
+    # meta, iinf and iloc are full boxes: skip their 4-byte version/flags
+    boxes = {t: (s, e) for t, s, e in _iter_boxes(data, meta[0] + 4, meta[1])}
+    if b"iinf" not in boxes or b"iloc" not in boxes:
+        return None
+
+    start, end = boxes[b"iinf"]
+    version = data[start]
+    start += 8 if version else 6
+    exif_item_id = None
+    for box_type, infe_start, _ in _iter_boxes(data, start, end):
+        if box_type != b"infe" or data[infe_start] < 2:
+            continue
+        if data[infe_start] == 2:
+            item_id, _, item_type = struct.unpack_from(">HH4s", data, infe_start + 4)
+        else:
+            item_id, _, item_type = struct.unpack_from(">IH4s", data, infe_start + 4)
+        if item_type == b"Exif":
+            exif_item_id = item_id
+            break
+    if exif_item_id is None:
+        return None
+
+    start, _ = boxes[b"iloc"]
+    version = data[start]
+    offset_size, length_size = data[start + 4] >> 4, data[start + 4] & 0x0F
+    base_offset_size, index_size = data[start + 5] >> 4, data[start + 5] & 0x0F
+    if version not in (1, 2):
+        index_size = 0
+    position = start + 6
+
+    def read_uint(size: int) -> int:
+        nonlocal position
+        value = int.from_bytes(data[position:position + size], "big")
+        position += size
+        return value
+
+    item_count = read_uint(2 if version < 2 else 4)
+    for _ in range(item_count):
+        item_id = read_uint(2 if version < 2 else 4)
+        construction_method = read_uint(2) & 0x0F if version in (1, 2) else 0
+        read_uint(2)  # data_reference_index
+        base_offset = read_uint(base_offset_size)
+        extents = []
+        for _ in range(read_uint(2)):
+            read_uint(index_size)
+            extents.append((read_uint(offset_size), read_uint(length_size)))
+        if item_id != exif_item_id:
+            continue
+        if construction_method != 0:  # Only file offsets are supported
+            return None
+        payload = b""
+        for extent_offset, extent_length in extents:
+            file_handle.seek(base_offset + extent_offset)
+            payload += file_handle.read(extent_length)
+        # The item starts with the offset to the TIFF header
+        (tiff_offset,) = struct.unpack_from(">I", payload, 0)
+        return payload[4 + tiff_offset:]
+    return None
+
+
+def _read_datetime_original(file_path: str) -> Optional[str]:
+    """Read the EXIF date string straight from the file header, or None."""
+    file_extension = get_file_extension(file_path)
+    if file_extension not in {".jpg", ".jpeg", ".heic"}:
+        return None
 
+    with open(file_path, "rb") as file_handle:
+        try:
+            if file_extension == ".heic":
+                tiff = _heic_get_exif(file_handle, file_handle.read(EXIF_HEADER_READ_SIZE))
+            else:
+                tiff = _mmap_jpeg_exif(file_handle)
+        except (struct.error, IndexError):
+            return None
+
+    return _tiff_get_datetime(tiff) if tiff else None
+
+
+def get_exif_date(file_path: str, stats: Optional[os.stat_result] = None) -> datetime:
+    """Retrieve the EXIF date, looking it up in the folder's cache first."""
+    if _exif_cache is None:
+        return _read_exif_date(file_path)
+
+    if stats is None:
+        stats = os.stat(file_path)
+    found, date_str = _exif_cache.get(file_path, stats)
+    if not found:
+        try:
+            date_str = _read_exif_date(file_path).isoformat()
+        except ExifMetadataNotFound:
+            date_str = None
+        _exif_cache.set(file_path, stats, date_str)
+
+    if date_str is None:
+        raise ExifMetadataNotFound
+    return datetime.fromisoformat(date_str)
+
+
+def _read_pillow_exif(file_path: str) -> Image.Exif:
+    """Read the EXIF tags of an image with Pillow, without decoding any pixels."""
+    if get_file_extension(file_path) == ".heic":
+        # Only the EXIF bytes are read; no HEIF tiles are decoded
+        try:
+            heif_file = open_heif(file_path, convert_hdr_to_8bit=False)
+        except ValueError as error:
+            raise UnidentifiedImageError(f"cannot identify image file {file_path!r}") from error
+        exif = Image.Exif()
+        exif_bytes = heif_file.info.get("exif")
+        if exif_bytes:
+            exif.load(exif_bytes)
+        return exif
+    with Image.open(file_path) as image:
+        return image.getexif()
+
+
+def _read_exif_date(file_path: str) -> datetime:
+    """Read the EXIF date from the file itself."""
+    # Dates already extracted by the ExifTool batch pass
+    normalized_path = _normalize_path(file_path)
+    if normalized_path in _batch_exif_dates:
+        date_str = _batch_exif_dates[normalized_path]
+        if date_str is None:
+            raise ExifMetadataNotFound
+        try:
+            return create_datetime(date_str)
+        except ValueError:
+            pass
+
+    # Fast path: parse the EXIF block directly without decoding the image
+    date_str = _read_datetime_original(file_path)
+    if date_str:
+        try:
+            return create_datetime(date_str)
+        except ValueError:
+            pass
 
-def get_exif_date(file_path: str) -> datetime:
-    """Retrieve the EXIF date or fallback to file creation date."""
     try:
-        with Image.open(file_path) as image:
-            metadata = image.getexif()
-            if 36867 in metadata:  # DateTimeOriginal
-                return create_datetime(metadata[36867])
-            elif 306 in metadata:  # DateTime
-                return create_datetime(metadata[306])
+        metadata = _read_pillow_exif(file_path)
+        if 36867 in metadata:  # DateTimeOriginal
+            return create_datetime(metadata[36867])
+        elif 306 in metadata:  # DateTime
+            return create_datetime(metadata[306])
     except (KeyError, ValueError):
         pass
 
     # Fallback to exifread library
     with open(file_path, "rb") as file_handle:
-        tags = exifread.process_file(file_handle)
+        # Skip MakerNotes/thumbnails and stop as soon as the date tag is read
+        tags = exifread.process_file(file_handle, details=False, stop_tag="DateTimeOriginal")
     exif_date = tags.get("EXIF DateTimeOriginal")
     if exif_date:
         return create_datetime(str(exif_date))
@@ -98,56 +556,343 @@ def get_exif_date(file_path: str) -> datetime:
     raise ExifMetadataNotFound
 
 
-def process_file(file_path: str, file_extension: str) -> str:
+def process_file(
+    file_path: str,
+    file_extension: str,
+    stats: Optional[os.stat_result] = None,
+    timestamp: Optional[float] = None,
+) -> str:
     """Process a file and generate a new name based on metadata or creation date."""
     try:
-        date = get_exif_date(file_path)
+        return get_new_file_name(get_exif_date(file_path, stats), file_extension)
     except ExifMetadataNotFound:
         append_to_file("meta_not_found.txt", os.path.basename(file_path))
-        date = get_file_creation_date(file_path)
     except DateNotFoundInFile:
         append_to_file("date_not_found.txt", os.path.basename(file_path))
-        date = get_file_creation_date(file_path)
 
-    return get_new_file_name(date, file_extension)
+    if timestamp is None:
+        timestamp = get_file_timestamp(file_path, stats)
+    return get_new_file_name_from_timestamp(timestamp, file_extension)
 
 
-def rename_file(folder_path: str, file_name: str):
-    """Rename a file based on metadata or creation date."""
-    file_path = os.path.join(folder_path, file_name)
-    file_extension = os.path.splitext(file_name)[1].lower()
+def _uring_queue_init(ring: Any):
+    """Set up a ring, dropping the setup flags on kernels that reject them."""
+    try:
+        # COOP_TASKRUN needs Linux 5.19 and SINGLE_ISSUER 6.0
+        liburing.io_uring_queue_init(
+            URING_RING_SIZE,
+            ring,
+            liburing.IORING_SETUP_COOP_TASKRUN | liburing.IORING_SETUP_SINGLE_ISSUER,
+        )
+    except OSError as error:
+        if error.errno != errno.EINVAL:
+            raise
+        liburing.io_uring_queue_init(URING_RING_SIZE, ring)
+
+
+def _uring_accepts_path(file_path: str) -> bool:
+    """Check whether liburing can take a path, which it only accepts as UTF-8 text."""
+    try:
+        file_path.encode("utf-8")
+    except UnicodeEncodeError:  # Surrogate-escaped bytes of a non-UTF-8 name
+        return False
+    return True
 
-    if file_extension not in VALID_EXTENSIONS:
-        return
 
+def _uring_supported() -> bool:
+    """Check whether the io_uring backend can be used on this machine."""
+    if liburing is None or platform.system() != "Linux":
+        return False
+    ring = liburing.Ring()
+    try:
+        _uring_queue_init(ring)
+    except OSError:
+        return False
+    liburing.io_uring_queue_exit(ring)
+    return True
+
+
+def _uring_submit_batch(prepare, items: list) -> list:
+    """Submit one io_uring operation per item; return each result or OSError."""
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    _uring_queue_init(ring)
+    results: list = [None] * len(items)
     try:
-        if file_extension in VALID_IMAGE_EXTENSIONS:
-            new_name = process_file(file_path, file_extension)
-        elif file_extension in VALID_VIDEO_EXTENSIONS:
-            video_date = get_file_creation_date(file_path)
-            new_name = get_new_file_name(video_date, file_extension)
-        
-        new_path = os.path.join(folder_path, new_name)
-
-        if file_path == new_path:
-            print(f"Skipping rename! - {file_path}")
+        for start in range(0, len(items), URING_RING_SIZE):
+            batch = items[start:start + URING_RING_SIZE]
+            for index, item in enumerate(batch, start):
+                sqe = liburing.io_uring_get_sqe(ring)
+                prepare(sqe, item)
+                sqe.user_data = index
+            liburing.io_uring_submit_and_wait(ring, len(batch))
+            for _ in batch:
+                liburing.io_uring_wait_cqe(ring, cqe)
+                entry = cqe[0]
+                try:
+                    results[entry.user_data] = entry.res
+                except OSError as error:
+                    results[entry.user_data] = error
+                liburing.io_uring_cqe_seen(ring, entry)
+    finally:
+        liburing.io_uring_queue_exit(ring)
+    return results
+
+
+def _uring_file_timestamps(file_paths: list) -> dict:
+    """Stat files in io_uring batches, mapping each readable path to its earliest timestamp."""
+    items = [(liburing.Statx(), file_path) for file_path in file_paths]
+    results = _uring_submit_batch(lambda sqe, item: liburing.io_uring_prep_statx(sqe, *item), items)
+    # Same choice as get_file_timestamp on Linux, where st_birthtime is unavailable
+    return {
+        file_path: min(statx.mtime, statx.ctime)
+        for (statx, file_path), result in zip(items, results)
+        if not isinstance(result, OSError)
+    }
+
+
+def _uring_rename_files(renames: list) -> list:
+    """Rename (old path, new path) pairs in io_uring batches."""
+    return _uring_submit_batch(
+        lambda sqe, pair: liburing.io_uring_prep_rename(sqe, *pair, RENAME_NOREPLACE),
+        renames,
+    )
+
+
+def _rename_no_replace(file_path: str, new_path: str):
+    """Rename a file, raising FileExistsError instead of overwriting new_path."""
+    if _renameat2 is not None:
+        if _renameat2(AT_FDCWD, os.fsencode(file_path), AT_FDCWD, os.fsencode(new_path), RENAME_NOREPLACE) == 0:
+            return
+        error = ctypes.get_errno()
+        if error not in RENAME_NOREPLACE_UNSUPPORTED:
+            raise OSError(error, os.strerror(error), file_path, None, new_path)
+    if os.path.exists(new_path):
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), file_path, None, new_path)
+    os.rename(file_path, new_path)
+
+
+def _claim_target(file_path: str, target_path: str, counter: int = 0) -> tuple:
+    """Claim the first name from target_path, target_path_1, ... not yet taken in this run.
+
+    Returns (claimed path, counter); the path is None when the file already
+    has the name it would be given.
+    """
+    root, file_extension = os.path.splitext(target_path)
+    with _output_lock:
+        while True:
+            candidate = f"{root}_{counter}{file_extension}" if counter else target_path
+            if candidate == file_path:
+                _claimed_paths.add(candidate)
+                return None, counter
+            if candidate not in _claimed_paths:
+                _claimed_paths.add(candidate)
+                return candidate, counter
+            counter += 1
+
+
+def _is_case_only_rename(file_path: str, new_path: str) -> bool:
+    """Whether new_path is file_path itself under a case-insensitive filesystem."""
+    if file_path.casefold() != new_path.casefold():
+        return False
+    try:
+        return os.path.samefile(file_path, new_path)
+    except OSError:
+        return False
+
+
+def _rename_without_overwrite(file_path: str, new_path: Optional[str], target_path: str, counter: int) -> Optional[str]:
+    """Rename a file, moving on to the next counter suffix while the name exists.
+
+    Returns the final path, or None if the file turned out to be named correctly.
+    """
+    while new_path is not None:
+        try:
+            _rename_no_replace(file_path, new_path)
+            return new_path
+        except FileExistsError:
+            # e.g. IMG_1.JPG -> IMG_1.jpg, where the "existing" file is the one being renamed
+            if _is_case_only_rename(file_path, new_path):
+                os.rename(file_path, new_path)
+                return new_path
+            new_path, counter = _claim_target(file_path, target_path, counter + 1)
+    return None
+
+
+def _report_rename(file_path: str, new_path: str):
+    """Record a completed rename in the cache and print the old and new name."""
+    if _exif_cache is not None:
+        _exif_cache.rename(file_path, new_path)
+    with _output_lock:
+        print(f"Old Name: {file_path}")
+        print(f"New Name: {new_path}")
+        print("----------------------------")
+
+
+def rename_file(entry: os.DirEntry, timestamp: Optional[float] = None, defer_rename: bool = False) -> Optional[tuple]:
+    """Rename a file based on metadata or creation date.
+
+    With defer_rename, the rename is not performed and the (old path, new path,
+    target path, counter) tuple is returned instead so the caller can batch it.
+    """
+    file_path = entry.path
+    file_name = entry.name
+    file_extension = get_file_extension(file_name)
+    kind = EXT_TO_KIND.get(file_extension)
+
+    if kind is None:
+        return None
+
+    try:
+        stats = None
+        if timestamp is None:
+            stats = entry.stat()
+            timestamp = get_file_timestamp(file_path, stats)
+        if kind == "img":
+            new_name = process_file(file_path, file_extension, stats, timestamp)
         else:
-            print(f"Old Name: {file_path}")
-            print(f"New Name: {new_path}")
-            os.rename(file_path, new_path)
-            print("----------------------------")
+            new_name = get_new_file_name_from_timestamp(timestamp, file_extension)
+
+        target_path = os.path.join(os.path.dirname(file_path), new_name)
+        new_path, counter = _claim_target(file_path, target_path)
+
+        if new_path is not None and defer_rename:
+            return file_path, new_path, target_path, counter
+        if new_path is not None:
+            new_path = _rename_without_overwrite(file_path, new_path, target_path, counter)
+        if new_path is None:
+            with _output_lock:
+                print(f"Skipping rename! - {file_path}")
+            return None
+        _report_rename(file_path, new_path)
     except UnidentifiedImageError:
         append_to_file("invalid_image_files.txt", file_name)
-        print(f"Unidentified image file: {file_name}")
+        with _output_lock:
+            print(f"Unidentified image file: {file_name}")
+    return None
 
 
-def main(folder_path: str):
+def main(folder_path: str, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, use_cache: bool = True):
     """Main function to process files in a folder."""
-    for file_name in os.listdir(folder_path):
-        rename_file(folder_path, file_name)
+    global _exif_cache
+    _claimed_paths.clear()
+    _batch_exif_dates.clear()
+    with os.scandir(folder_path) as iterator:
+        entries = list(iterator)
+
+    if use_cache:
+        _exif_cache = ExifCache(os.path.join(folder_path, EXIF_CACHE_FILE_NAME))
+    try:
+        _process_entries(entries, max_concurrency)
+    finally:
+        close_log_files()
+        if _exif_cache is not None:
+            _exif_cache.close()
+            _exif_cache = None
+
+
+def _process_entries(entries: list, max_concurrency: int):
+    """Rename the files of a folder listing."""
+    # Extract all image dates with one ExifTool process when it is installed
+    if shutil.which("exiftool"):
+        image_paths = [
+            entry.path
+            for entry in entries
+            if EXT_TO_KIND.get(get_file_extension(entry.name)) == "img"
+            and (_exif_cache is None or not _exif_cache.get(entry.path, entry.stat())[0])
+        ]
+        with ExifToolSession() as session:
+            _batch_exif_dates.update(session.get_dates(image_paths))
+
+    # On Linux, batch the stat and rename syscalls through io_uring when available
+    use_uring = _uring_supported()
+    timestamps = {}
+    if use_uring:
+        # Images looked up in the cache are stat'ed once through entry.stat() instead
+        stat_kinds = ("vid",) if _exif_cache is not None else ("img", "vid")
+        timestamps = _uring_file_timestamps(
+            [
+                entry.path
+                for entry in entries
+                if EXT_TO_KIND.get(get_file_extension(entry.name)) in stat_kinds and _uring_accepts_path(entry.path)
+            ]
+        )
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        # Consume the results so worker exceptions are raised here
+        planned_renames = list(
+            executor.map(
+                lambda entry: rename_file(
+                    entry, timestamps.get(entry.path), defer_rename=use_uring and _uring_accepts_path(entry.path)
+                ),
+                entries,
+            )
+        )
+
+    if use_uring:
+        renames = [rename for rename in planned_renames if rename]
+        results = _uring_rename_files([(file_path, new_path) for file_path, new_path, _, _ in renames])
+        # The whole batch has already run: report every result before raising a failure
+        errors = []
+        for (file_path, new_path, target_path, counter), result in zip(renames, results):
+            try:
+                if isinstance(result, OSError):
+                    if not isinstance(result, FileExistsError) and result.errno not in RENAME_NOREPLACE_UNSUPPORTED:
+                        raise result
+                    # Retry taken names, and filesystems without RENAME_NOREPLACE, synchronously
+                    new_path = _rename_without_overwrite(file_path, new_path, target_path, counter)
+            except OSError as error:
+                errors.append(error)
+                continue
+            if new_path is None:
+                with _output_lock:
+                    print(f"Skipping rename! - {file_path}")
+                continue
+            _report_rename(file_path, new_path)
+        if errors:
+            raise errors[0]
+
+
+def positive_int(value: str) -> int:
+    """Argparse type accepting only integers greater than zero."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value!r}")
+    return number
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Rename images and videos based on the date they were taken.")
+    parser.add_argument(
+        "folder_path",
+        nargs="?",
+        default=os.getcwd(),
+        help="directory containing the files to rename (default: current directory)",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=positive_int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help=f"number of files to process in parallel (default: {DEFAULT_MAX_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"do not read or write the {EXIF_CACHE_FILE_NAME} EXIF date cache in the folder",
+    )
+    return parser.parse_args()
+
+
+def cli():
+    """Entry point of the irename command."""
+    args = parse_args()
+    main(args.folder_path, args.max_concurrency, not args.no_cache)
 
 
 # Run the script
 if __name__ == "__main__":
-    folder_path = "/user/xyz/down/up"
-    main(folder_path)
+    cli()
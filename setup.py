@@ -0,0 +1,55 @@
+# Optional ahead-of-time compilation of irename.py with mypyc.
+#
+#   pip install .
+#
+# installs an `irename` command backed by the compiled module (pyproject.toml
+# pulls mypy into the build environment). With IRENAME_NO_MYPYC=1, when mypyc
+# cannot be imported, or when the C extension fails to build (e.g. no compiler),
+# the pure-Python module is installed instead.
+
+import os
+import warnings
+
+from setuptools import setup
+from setuptools.command.build_ext import build_ext
+from setuptools.errors import CCompilerError, CompileError, ExecError, PlatformError
+
+
+class OptionalBuildExt(build_ext):
+    """Build the mypyc extension, falling back to pure Python when that fails."""
+
+    def run(self):
+        try:
+            super().run()
+        except (CCompilerError, CompileError, ExecError, PlatformError) as error:
+            warnings.warn(f"building the mypyc extension failed ({error}); installing irename as pure Python")
+
+    def build_extension(self, ext):
+        try:
+            super().build_extension(ext)
+        except (CCompilerError, CompileError, ExecError, PlatformError) as error:
+            warnings.warn(f"building {ext.name} failed ({error}); installing irename as pure Python")
+
+
+with open("requirements.txt") as file_handle:
+    install_requires = file_handle.read().split()
+
+ext_modules = []
+if not os.environ.get("IRENAME_NO_MYPYC"):
+    try:
+        from mypyc.build import mypycify
+    except ImportError:
+        warnings.warn("mypyc is not available; installing irename as pure Python")
+    else:
+        ext_modules = mypycify(["--ignore-missing-imports", "irename.py"], opt_level="3")
+
+setup(
+    name="irename",
+    version="0.1.0",
+    description="Rename images and videos based on the date they were taken",
+    py_modules=["irename"],
+    ext_modules=ext_modules,
+    cmdclass={"build_ext": OptionalBuildExt},
+    install_requires=install_requires,
+    entry_points={"console_scripts": ["irename = irename:cli"]},
+)